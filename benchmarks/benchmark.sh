@@ -24,7 +24,7 @@ declare -A DOCKERFILE
 declare -A CONTEXT
 
 DOCKERFILE[mesa]="$PROJECT_ROOT/source/mesa/Dockerfile"
-CONTEXT[mesa]="$PROJECT_ROOT/source/mesa"
+CONTEXT[mesa]="$PROJECT_ROOT/source"
 
 DOCKERFILE[agentsjl]="$PROJECT_ROOT/source/agentsjl/Dockerfile"
 CONTEXT[agentsjl]="$PROJECT_ROOT/source/agentsjl"
@@ -33,7 +33,7 @@ DOCKERFILE[gama]="$PROJECT_ROOT/source/gama/Dockerfile"
 CONTEXT[gama]="$PROJECT_ROOT/source/gama"
 
 DOCKERFILE[agentpy]="$PROJECT_ROOT/source/agentpy/Dockerfile"
-CONTEXT[agentpy]="$PROJECT_ROOT/source/agentpy"
+CONTEXT[agentpy]="$PROJECT_ROOT/source"
 
 if [ -z "${DOCKERFILE[$PLATFORM]}" ]; then
   echo "Unknown platform: $PLATFORM"
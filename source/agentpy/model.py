@@ -1,9 +1,18 @@
+import os
+import sys
 import time
 import random
 import numpy as np
 import agentpy as ap
 
 import argparse
+import importlib.util
+
+# wspólny moduł śladu zdarzeń: w obrazie Dockera leży obok model.py, w repo – w source/
+if importlib.util.find_spec("event_trace") is None:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from event_trace import (EventTracer, EV_SPAWN, EV_BORN, EV_MOVE, EV_EAT, EV_EATEN,
+                         EV_STARVE, EV_REPRODUCE, KIND_PREY, KIND_PREDATOR)
 
 parser = argparse.ArgumentParser(description="Prey-Predator ABM (AgentPy)")
 
@@ -35,8 +44,25 @@ parser.add_argument(
     help="Szerokość i długość siatki"
 )
 
+parser.add_argument(
+    "--trace",
+    type=str,
+    default=None,
+    help="Plik, do którego zapisywany jest binarny ślad zdarzeń (domyślnie wyłączone)"
+)
+
+parser.add_argument(
+    "--trace-buffer",
+    type=int,
+    default=1 << 16,
+    help="Liczba rekordów buforowanych w pamięci przed zapisem do pliku śladu"
+)
+
 args = parser.parse_args()
 
+if args.trace_buffer < 1:
+    parser.error("--trace-buffer musi być >= 1")
+
 STEPS_TO_RUN = args.steps
 NB_PREYS_INIT = args.preys
 NB_PREDATORS_INIT = args.predators
@@ -89,6 +115,7 @@ class GenericAgent(ap.Agent):
 
             energy_share = self.energy / nb_offsprings
 
+            trace = self.model.trace
             for _ in range(nb_offsprings):
                 offspring = agent_class(self.model)
                 offspring.energy = energy_share
@@ -96,13 +123,22 @@ class GenericAgent(ap.Agent):
                 pos = self.grid.positions[self]
                 self.grid.add_agents([offspring], positions=[pos])
                 self.model.agents.append(offspring)
+                if trace is not None:
+                    trace(offspring.id, EV_BORN, offspring.trace_kind, pos[0], pos[1], energy_share)
 
             # energia rodzica też dzielona (tak jak w Twoim kodzie)
             self.energy /= nb_offsprings
+            if trace is not None:
+                x, y = self.grid.positions[self]
+                trace(self.id, EV_REPRODUCE, self.trace_kind, x, y, self.energy)
 
     def die_check(self):
         """Usunięcie agenta z grida i listy modelu."""
         if self.energy <= 0:
+            trace = self.model.trace
+            if trace is not None:
+                x, y = self.grid.positions[self]
+                trace(self.id, EV_STARVE, self.trace_kind, x, y, self.energy)
             self.grid.remove_agents([self])
             if self in self.model.agents:
                 self.model.agents.remove(self)
@@ -111,6 +147,7 @@ class GenericAgent(ap.Agent):
 
 
 class Prey(GenericAgent):
+    trace_kind = KIND_PREY
 
     def setup(self):
         super().setup()
@@ -130,16 +167,23 @@ class Prey(GenericAgent):
         self.energy -= self.energy_consum
 
         # Jedzenie (NumPy jako bufor wegetacji)
+        # jeden rekord śladu na krok: EV_EAT = ruch + jedzenie, EV_MOVE = sam ruch
+        event = EV_MOVE
         x, y = self.grid.positions[self]
         available_food = self.model.vegetation_food[x, y]
         if available_food > 0:
             transfer = min(PREY_MAX_TRANSFER, available_food)
             self.model.vegetation_food[x, y] -= transfer
             self.energy += transfer
+            event = EV_EAT
 
         if self.energy > self.max_energy:
             self.energy = self.max_energy
 
+        trace = self.model.trace
+        if trace is not None:
+            trace(self.id, event, KIND_PREY, x, y, self.energy)
+
         if self.die_check():
             return
 
@@ -147,6 +191,7 @@ class Prey(GenericAgent):
 
 
 class Predator(GenericAgent):
+    trace_kind = KIND_PREDATOR
 
     def setup(self):
         super().setup()
@@ -165,20 +210,28 @@ class Predator(GenericAgent):
         self.energy -= self.energy_consum
 
         # Jedzenie – inne agenty w tej samej komórce
+        trace = self.model.trace
+        event = EV_MOVE
         pos = self.grid.positions[self]
         cell_mates = self.grid.agents[pos].to_list()
         reachable_preys = [obj for obj in cell_mates if isinstance(obj, Prey)]
 
         if reachable_preys:
             victim = self.random.choice(reachable_preys)
+            if trace is not None:
+                trace(victim.id, EV_EATEN, KIND_PREY, pos[0], pos[1], victim.energy)
             self.grid.remove_agents([victim])
             if victim in self.model.agents:
                 self.model.agents.remove(victim)
             self.energy += PREDATOR_ENERGY_TRANSFER
+            event = EV_EAT
 
         if self.energy > self.max_energy:
             self.energy = self.max_energy
 
+        if trace is not None:
+            trace(self.id, event, KIND_PREDATOR, pos[0], pos[1], self.energy)
+
         if self.die_check():
             return
 
@@ -217,6 +270,15 @@ class PreyPredatorModel(ap.Model):
         self.vegetation_prod = np.random.rand(self.width, self.height) * 0.01
         self.max_food = CELL_MAX_FOOD
 
+        # Ślad zdarzeń – tylko gdy podano plik (parametr trace)
+        # trace = tracer.record – agenci robią jedno wyszukanie na krok
+        self.tracer = None
+        self.trace = None
+        if self.p.get("trace") is not None:
+            self.tracer = EventTracer(self.p.trace, self, self.p.get("trace_buffer", 1 << 16),
+                                      framework="agentpy", prey_max_transfer=PREY_MAX_TRANSFER)
+            self.trace = self.tracer.record
+
         # Tworzenie agentów
         for _ in range(self.nb_preys):
             a = Prey(self)
@@ -229,7 +291,15 @@ class PreyPredatorModel(ap.Model):
         # Rozmieszczenie agentów losowo po gridzie
         self.grid.add_agents(self.agents, random=True)
 
+        if self.trace is not None:
+            for agent in self.agents:
+                x, y = self.grid.positions[agent]
+                self.trace(agent.id, EV_SPAWN, agent.trace_kind, x, y, agent.energy)
+
     def step(self):
+        if self.tracer is not None:
+            self.tracer.begin_step()
+
         # 1. Wzrost trawy (cała macierz na raz)
         self.vegetation_food += self.vegetation_prod
         np.clip(self.vegetation_food, 0, self.max_food, out=self.vegetation_food)
@@ -265,6 +335,8 @@ if __name__ == "__main__":
         nb_predators=NB_PREDATORS_INIT,
         width=WIDTH,
         height=HEIGHT,
+        trace=args.trace,
+        trace_buffer=args.trace_buffer,
     )
 
     # Inicjalizacja modelu
@@ -296,6 +368,11 @@ if __name__ == "__main__":
 
     loop_end = time.time()
     total_time = loop_end - loop_start
+
+    if model.tracer is not None:
+        model.tracer.close()
+        print(f"Ślad zdarzeń: {model.tracer.count} rekordów -> {model.tracer.path}")
+
     avg_fps = (last_step + 1) / total_time if total_time > 0 else 0.0
     avg_step = total_time / (last_step + 1)
 
@@ -0,0 +1,124 @@
+import os
+import sys
+import random
+import argparse
+import tempfile
+import importlib.util
+import numpy as np
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SOURCE_DIR)
+from trace_replay import replay
+
+# ==========================================
+# SPRAWDZENIE ŚLADU: żywy model vs. odtworzenie z pliku
+# ==========================================
+
+
+def load_model(framework, preys, predators):
+    """Importuje source/<framework>/model.py – parsuje argumenty przy imporcie, więc podmieniamy argv."""
+    argv = sys.argv
+    sys.argv = ["model.py", "--preys", str(preys), "--predators", str(predators)]
+    try:
+        path = os.path.join(SOURCE_DIR, framework, "model.py")
+        spec = importlib.util.spec_from_file_location(f"{framework}_model", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.argv = argv
+    return module
+
+
+def build(module, framework, preys, predators, trace_path, trace_buffer, seed):
+    """Seedowany model z włączonym śladem + funkcja zwracająca {id: ((x, y), energia)}."""
+    random.seed(seed)
+    np.random.seed(seed)
+
+    if framework == "mesa":
+        model = module.PreyPredatorModel(preys, predators, trace_path=trace_path,
+                                         trace_buffer=trace_buffer)
+        model.random.seed(seed)
+
+        def snapshot():
+            return {a.unique_id: (tuple(a.pos), np.float32(a.energy)) for a in model.schedule.agents}
+    else:
+        model = module.PreyPredatorModel(dict(
+            nb_preys=preys, nb_predators=predators,
+            width=module.WIDTH, height=module.HEIGHT,
+            seed=seed, trace=trace_path, trace_buffer=trace_buffer,
+        ))
+        model.setup()
+
+        def snapshot():
+            return {a.id: (tuple(int(v) for v in model.grid.positions[a]), np.float32(a.energy))
+                    for a in model.agents}
+
+    return model, snapshot
+
+
+def check(framework, steps, preys, predators, trace_buffer, seed):
+    module = load_model(framework, preys, predators)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path = os.path.join(tmp, f"{framework}.bin")
+        model, snapshot = build(module, framework, preys, predators,
+                                trace_path, trace_buffer, seed)
+
+        expected = {0: (snapshot(), model.vegetation_food.copy())}
+        extinct_at = None
+        for step in range(1, steps + 1):
+            model.step()
+            expected[step] = (snapshot(), model.vegetation_food.copy())
+            if extinct_at is None and not expected[step][0]:
+                extinct_at = step
+        model.tracer.close()
+
+        for step, (population, vegetation) in expected.items():
+            state = replay(trace_path, step)
+            replayed = {int(r["agent"]): ((int(r["x"]), int(r["y"])), r["energy"])
+                        for r in state["population"]}
+            if replayed != population:
+                raise SystemExit(f"{framework}: populacja różni się w kroku {step}")
+            if not np.array_equal(state["vegetation_food"], vegetation):
+                raise SystemExit(f"{framework}: trawa różni się w kroku {step}")
+
+        for bad_step in (-1, steps + 1):
+            try:
+                replay(trace_path, bad_step)
+            except ValueError:
+                pass
+            else:
+                raise SystemExit(f"{framework}: krok {bad_step} powinien zostać odrzucony")
+
+    note = f", wymarcie w kroku {extinct_at}" if extinct_at is not None else ""
+    print(f"{framework}: OK ({steps} kroków, seed={seed}{note})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Porównanie śladu zdarzeń z żywym modelem")
+    parser.add_argument(
+        "--framework",
+        nargs="+",
+        choices=["mesa", "agentpy"],
+        default=["mesa", "agentpy"],
+        help="Modele do sprawdzenia"
+    )
+    parser.add_argument("--steps", type=int, default=150, help="Liczba kroków symulacji")
+    parser.add_argument("--preys", type=int, default=200, help="Początkowa liczba prey")
+    parser.add_argument(
+        "--predators",
+        type=int,
+        default=20,
+        help="Początkowa liczba predatorów (i rozmiar siatki, jak w model.py)"
+    )
+    parser.add_argument(
+        "--trace-buffer",
+        type=int,
+        default=97,
+        help="Mały bufor, żeby zapis do pliku następował także w środku kroku"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Seed RNG")
+    args = parser.parse_args()
+
+    for framework in args.framework:
+        check(framework, args.steps, args.preys, args.predators, args.trace_buffer, args.seed)
@@ -0,0 +1,151 @@
+import json
+import struct
+import numpy as np
+
+# ==========================================
+# FORMAT ŚLADU ZDARZEŃ
+# ==========================================
+#
+# [magic 8B][liczba kroków <u4][długość nagłówka <u4][nagłówek JSON]
+# [trawa na starcie <f8 W*H][przyrost trawy <f8 W*H][rekordy TRACE_DTYPE...]
+#
+# Rekord: krok, id agenta, zdarzenie, typ agenta, komórka (x, y), energia.
+
+TRACE_MAGIC = b"PPTRACE2"
+TRACE_STEPS = struct.Struct("<I")
+TRACE_DTYPE = np.dtype([
+    ("step", "<u4"), ("agent", "<u4"), ("event", "u1"), ("kind", "u1"),
+    ("x", "<u2"), ("y", "<u2"), ("energy", "<f4"),
+])
+TRACE_RECORD_SIZE = TRACE_DTYPE.itemsize
+
+# Pole "step" jest pomijane przy zapisie rekordu (4x) i uzupełniane hurtowo przy flush()
+TRACE_RECORD = struct.Struct("<4xIBBHHf")
+
+EV_SPAWN, EV_BORN, EV_MOVE, EV_EAT, EV_EATEN, EV_STARVE, EV_REPRODUCE = range(7)
+KIND_PREY, KIND_PREDATOR = range(2)
+
+
+class EventTracer:
+    """Zapisuje zdarzenia agentów do bufora NumPy i zrzuca go do pliku przez memmap."""
+
+    __slots__ = ('path', 'step', 'count', 'records_offset', 'record',
+                 '_buffer', '_pending', '_marks')
+
+    def __init__(self, path, model, capacity, framework, prey_max_transfer):
+        if capacity < 1:
+            raise ValueError(f"Rozmiar bufora śladu musi być >= 1 (podano {capacity})")
+
+        self.path = path
+        self.step = 0
+        self.count = 0
+
+        header = json.dumps({
+            "framework": framework,
+            "width": model.width,
+            "height": model.height,
+            "prey_max_transfer": prey_max_transfer,
+            "cell_max_food": model.max_food,
+            "record_size": TRACE_RECORD_SIZE,
+        }).encode()
+        header += b" " * (-(len(TRACE_MAGIC) + 2 * TRACE_STEPS.size + len(header)) % 8)
+
+        # Nagłówek + początkowy stan trawy (potrzebny do odtworzenia komórek)
+        with open(path, "wb") as f:
+            f.write(TRACE_MAGIC)
+            f.write(TRACE_STEPS.pack(0))
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(np.ascontiguousarray(model.vegetation_food, dtype="<f8").tobytes())
+            f.write(np.ascontiguousarray(model.vegetation_prod, dtype="<f8").tobytes())
+            self.records_offset = f.tell()
+
+        self._buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.record, self._pending = self._make_record()
+        # (indeks rekordu w buforze, krok) – początki kroków w bieżącym buforze
+        self._marks = [(0, 0)]
+
+    def _make_record(self):
+        """record(agent, event, kind, x, y, energy) jako domknięcie – wywoływane raz na agenta
+        w każdym kroku, więc offset trzymany jest w zmiennej lokalnej zamiast w atrybucie."""
+        raw = memoryview(self._buffer.view(np.uint8))
+        pack = TRACE_RECORD.pack_into
+        end = raw.nbytes
+        offset = 0
+
+        def record(agent, event, kind, x, y, energy):
+            nonlocal offset
+            # pack_into bezpośrednio do bufora – bez tworzenia obiektów NumPy
+            pack(raw, offset, agent, event, kind, x, y, energy)
+            offset += TRACE_RECORD_SIZE
+            if offset >= end:
+                self.flush()
+
+        def pending(reset=False):
+            nonlocal offset
+            n = offset // TRACE_RECORD_SIZE
+            if reset:
+                offset = 0
+            return n
+
+        return record, pending
+
+    def begin_step(self):
+        self.step += 1
+        self._marks.append((self._pending(), self.step))
+
+    def flush(self):
+        n = self._pending()
+        if n > 0:
+            starts, steps = zip(*self._marks)
+            counts = np.diff(starts + (n,))
+            self._buffer["step"][:n] = np.repeat(steps, counts)
+
+            start = self.records_offset + self.count * TRACE_RECORD_SIZE
+            with open(self.path, "r+b") as f:
+                f.truncate(start + n * TRACE_RECORD_SIZE)
+
+            out = np.memmap(self.path, dtype=TRACE_DTYPE, mode="r+", offset=start, shape=(n,))
+            out[:] = self._buffer[:n]
+            out.flush()
+            del out
+
+            self.count += n
+            self._pending(reset=True)
+
+        self._marks = [(0, self.step)]
+
+    def close(self):
+        self.flush()
+        # liczba zasymulowanych kroków – stan po ostatnim zdarzeniu też jest odtwarzalny
+        with open(self.path, "r+b") as f:
+            f.seek(len(TRACE_MAGIC))
+            f.write(TRACE_STEPS.pack(self.step))
+
+
+def load_trace(path):
+    """Wczytuje nagłówek, początkowy stan trawy i rekordy (memmap, bez kopiowania)."""
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path}: to nie jest plik śladu zdarzeń")
+        (steps,) = TRACE_STEPS.unpack(f.read(TRACE_STEPS.size))
+        (header_len,) = struct.unpack("<I", f.read(4))
+        meta = json.loads(f.read(header_len))
+        meta["steps"] = steps
+
+        if meta["record_size"] != TRACE_RECORD_SIZE:
+            raise ValueError(f"{path}: nieobsługiwany rozmiar rekordu {meta['record_size']}")
+
+        shape = (meta["width"], meta["height"])
+        cells = shape[0] * shape[1]
+        food = np.fromfile(f, dtype="<f8", count=cells).reshape(shape)
+        prod = np.fromfile(f, dtype="<f8", count=cells).reshape(shape)
+        offset = f.tell()
+        f.seek(0, 2)
+        n = (f.tell() - offset) // TRACE_RECORD_SIZE
+
+    if n == 0:
+        records = np.zeros(0, dtype=TRACE_DTYPE)
+    else:
+        records = np.memmap(path, dtype=TRACE_DTYPE, mode="r", offset=offset, shape=(n,))
+    return meta, food, prod, records
@@ -1,3 +1,5 @@
+import os
+import sys
 import time
 import random
 import numpy as np
@@ -5,6 +7,13 @@ from mesa import Agent, Model
 from mesa.time import RandomActivation
 from mesa.space import MultiGrid
 import argparse
+import importlib.util
+
+# wspólny moduł śladu zdarzeń: w obrazie Dockera leży obok model.py, w repo – w source/
+if importlib.util.find_spec("event_trace") is None:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from event_trace import (EventTracer, EV_SPAWN, EV_BORN, EV_MOVE, EV_EAT, EV_EATEN,
+                         EV_STARVE, EV_REPRODUCE, KIND_PREY, KIND_PREDATOR)
 
 parser = argparse.ArgumentParser(description="Prey-Predator ABM (Mesa)")
 
@@ -36,8 +45,25 @@ parser.add_argument(
     help="Szerokość i długość siatki"
 )
 
+parser.add_argument(
+    "--trace",
+    type=str,
+    default=None,
+    help="Plik, do którego zapisywany jest binarny ślad zdarzeń (domyślnie wyłączone)"
+)
+
+parser.add_argument(
+    "--trace-buffer",
+    type=int,
+    default=1 << 16,
+    help="Liczba rekordów buforowanych w pamięci przed zapisem do pliku śladu"
+)
+
 args = parser.parse_args()
 
+if args.trace_buffer < 1:
+    parser.error("--trace-buffer musi być >= 1")
+
 STEPS_TO_RUN = args.steps
 NB_PREYS_INIT = args.preys
 NB_PREDATORS_INIT = args.predators
@@ -90,16 +116,26 @@ class GenericAgent(Agent):
             nb_offsprings = random.randint(1, self.nb_max_offsprings)
             energy_share = self.energy / nb_offsprings
 
+            trace = self.model.trace
+            x, y = self.pos
             for _ in range(nb_offsprings):
                 offspring = agent_class(self.model.next_id(), self.model)
                 offspring.energy = energy_share
                 self.model.grid.place_agent(offspring, self.pos)
                 self.model.schedule.add(offspring)
+                if trace is not None:
+                    trace(offspring.unique_id, EV_BORN, offspring.trace_kind, x, y, energy_share)
 
             self.energy /= nb_offsprings
+            if trace is not None:
+                trace(self.unique_id, EV_REPRODUCE, self.trace_kind, x, y, self.energy)
 
     def die_check(self):
         if self.energy <= 0:
+            trace = self.model.trace
+            if trace is not None:
+                x, y = self.pos
+                trace(self.unique_id, EV_STARVE, self.trace_kind, x, y, self.energy)
             self.model.grid.remove_agent(self)
             self.model.schedule.remove(self)
             return True
@@ -107,6 +143,8 @@ class GenericAgent(Agent):
 
 
 class Prey(GenericAgent):
+    trace_kind = KIND_PREY
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model,
                          PREY_MAX_ENERGY, PREY_ENERGY_CONSUM,
@@ -118,19 +156,27 @@ class Prey(GenericAgent):
         self.basic_move()
         self.energy -= self.energy_consum
 
+        # jeden rekord na krok: EV_EAT = ruch + jedzenie, EV_MOVE = sam ruch
+        event = EV_MOVE
         x, y = self.pos
         available_food = self.model.vegetation_food[x, y]
         if available_food > 0:
             transfer = min(PREY_MAX_TRANSFER, available_food)
             self.model.vegetation_food[x, y] -= transfer
             self.energy += transfer
+            event = EV_EAT
 
         if self.energy > self.max_energy: self.energy = self.max_energy
+        trace = self.model.trace
+        if trace is not None:
+            trace(self.unique_id, event, KIND_PREY, x, y, self.energy)
         if self.die_check(): return
         self.attempt_reproduce(Prey)
 
 
 class Predator(GenericAgent):
+    trace_kind = KIND_PREDATOR
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model,
                          PREDATOR_MAX_ENERGY, PREDATOR_ENERGY_CONSUM,
@@ -139,26 +185,36 @@ class Predator(GenericAgent):
 
     def step(self):
         if not self.pos: return
+        trace = self.model.trace
         self.basic_move()
         self.energy -= self.energy_consum
 
+        event = EV_MOVE
         cell_mates = self.model.grid.get_cell_list_contents([self.pos])
         reachable_preys = [obj for obj in cell_mates if type(obj) is Prey]
 
         if reachable_preys:
             victim = random.choice(reachable_preys)
+            if trace is not None:
+                x, y = self.pos
+                trace(victim.unique_id, EV_EATEN, KIND_PREY, x, y, victim.energy)
             self.model.grid.remove_agent(victim)
             self.model.schedule.remove(victim)
             self.energy += PREDATOR_ENERGY_TRANSFER
+            event = EV_EAT
 
         if self.energy > self.max_energy: self.energy = self.max_energy
+        if trace is not None:
+            x, y = self.pos
+            trace(self.unique_id, event, KIND_PREDATOR, x, y, self.energy)
         if self.die_check(): return
         self.attempt_reproduce(Predator)
 
 
 
 class PreyPredatorModel(Model):
-    def __init__(self, nb_preys=NB_PREYS_INIT, nb_predators=NB_PREDATORS_INIT):
+    def __init__(self, nb_preys=NB_PREYS_INIT, nb_predators=NB_PREDATORS_INIT,
+                 trace_path=None, trace_buffer=1 << 16):
         super().__init__()
         self.width = WIDTH
         self.height = HEIGHT
@@ -169,6 +225,14 @@ class PreyPredatorModel(Model):
         self.vegetation_prod = np.random.rand(self.width, self.height) * 0.01
         self.max_food = CELL_MAX_FOOD
 
+        # trace = tracer.record – agenci robią jedno wyszukanie na krok
+        self.tracer = None
+        self.trace = None
+        if trace_path is not None:
+            self.tracer = EventTracer(trace_path, self, trace_buffer,
+                                      framework="mesa", prey_max_transfer=PREY_MAX_TRANSFER)
+            self.trace = self.tracer.record
+
         for _ in range(nb_preys):
             a = Prey(self.next_id(), self)
             self.schedule.add(a)
@@ -179,7 +243,15 @@ class PreyPredatorModel(Model):
             self.schedule.add(b)
             self.grid.place_agent(b, (random.randrange(self.width), random.randrange(self.height)))
 
+        if self.trace is not None:
+            for agent in self.schedule.agents:
+                x, y = agent.pos
+                self.trace(agent.unique_id, EV_SPAWN, agent.trace_kind, x, y, agent.energy)
+
     def step(self):
+        if self.tracer is not None:
+            self.tracer.begin_step()
+
         self.vegetation_food += self.vegetation_prod
         np.clip(self.vegetation_food, 0, self.max_food, out=self.vegetation_food)
 
@@ -202,7 +274,7 @@ if __name__ == "__main__":
     print(f"Konfiguracja: {WIDTH}x{HEIGHT}, Prey: {NB_PREYS_INIT}, Predator: {NB_PREDATORS_INIT}")
 
     setup_start = time.time()
-    model = PreyPredatorModel()
+    model = PreyPredatorModel(trace_path=args.trace, trace_buffer=args.trace_buffer)
     setup_time = time.time() - setup_start
     print(f"Czas inicjalizacji: {setup_time:.4f} s")
 
@@ -220,6 +292,10 @@ if __name__ == "__main__":
 
     loop_end = time.time()
     total_time = loop_end - loop_start
+
+    if model.tracer is not None:
+        model.tracer.close()
+        print(f"Ślad zdarzeń: {model.tracer.count} rekordów -> {model.tracer.path}")
     avg_fps = (i + 1) / total_time
     avg_step = total_time / (i + 1)
 
@@ -0,0 +1,114 @@
+import time
+import argparse
+import numpy as np
+
+from event_trace import EV_EAT, EV_EATEN, EV_STARVE, KIND_PREY, KIND_PREDATOR, load_trace
+
+
+def replay_population(records, step):
+    """Stan agentów po kroku `step` – ostatnie zdarzenie każdego agenta decyduje o stanie."""
+    end = np.searchsorted(records["step"], step, side="right")
+    recs = records[:end]
+
+    # ostatnie wystąpienie każdego id (unique na odwróconej tablicy daje pierwsze od końca)
+    ids, rev_idx = np.unique(recs["agent"][::-1], return_index=True)
+    last = recs[len(recs) - 1 - rev_idx]
+
+    alive = (last["event"] != EV_EATEN) & (last["event"] != EV_STARVE)
+    return last[alive]
+
+
+def replay_vegetation(meta, food, prod, records, step):
+    """Odtwarza trawę krok po kroku: wzrost + zjedzenie przez prey w kolejności zdarzeń."""
+    food = food.copy()
+    flat = food.reshape(-1)
+    height = meta["height"]
+    max_transfer = meta["prey_max_transfer"]
+    max_food = meta["cell_max_food"]
+
+    eats = records[(records["event"] == EV_EAT) & (records["kind"] == KIND_PREY)]
+    cells = eats["x"].astype(np.int64) * height + eats["y"]
+    bounds = np.searchsorted(eats["step"], np.arange(1, step + 2))
+
+    for t in range(1, step + 1):
+        food += prod
+        np.clip(food, 0, max_food, out=food)
+
+        step_cells = cells[bounds[t - 1]:bounds[t]]
+        if step_cells.size == 0:
+            continue
+
+        # kilka prey w tej samej komórce je po kolei – te same operacje co w modelu
+        uniq, counts = np.unique(step_cells, return_counts=True)
+        for j in range(counts.max()):
+            sel = uniq[counts > j]
+            available = flat[sel]
+            flat[sel] = available - np.minimum(max_transfer, available)
+
+    return food
+
+
+def replay(path, step=None):
+    """Pełny stan modelu po kroku `step` (domyślnie ostatni zasymulowany krok)."""
+    meta, food, prod, records = load_trace(path)
+    steps = meta["steps"]
+    if steps == 0 and len(records) and records["step"][-1] > 0:
+        raise ValueError(f"{path}: ślad nie został zamknięty (brak liczby kroków)")
+
+    if step is None:
+        step = steps
+    if step < 0 or step > steps:
+        raise ValueError(f"Krok {step} poza zakresem śladu (0..{steps})")
+
+    population = replay_population(records, step)
+    shape = (meta["width"], meta["height"])
+    counts = np.zeros((2,) + shape, dtype=np.int64)
+    np.add.at(counts, (population["kind"], population["x"], population["y"]), 1)
+
+    return {
+        "step": step,
+        "population": population,
+        "prey_per_cell": counts[KIND_PREY],
+        "predators_per_cell": counts[KIND_PREDATOR],
+        "vegetation_food": replay_vegetation(meta, food, prod, records, step),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Odtwarzanie stanu z binarnego śladu zdarzeń")
+    parser.add_argument("trace", help="Plik śladu zapisany przez model.py --trace")
+    parser.add_argument(
+        "--step",
+        type=int,
+        default=None,
+        help="Krok, dla którego odtwarzany jest stan (domyślnie ostatni)"
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="Opcjonalny plik .npz z odtworzonym stanem"
+    )
+    args = parser.parse_args()
+
+    if args.step is not None and args.step < 0:
+        parser.error("--step musi być >= 0")
+
+    start = time.time()
+    try:
+        state = replay(args.trace, args.step)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.time() - start
+
+    population = state["population"]
+    n_prey = int(np.count_nonzero(population["kind"] == KIND_PREY))
+    n_pred = int(np.count_nonzero(population["kind"] == KIND_PREDATOR))
+
+    print(f"Krok {state['step']}: Prey={n_prey}, Pred={n_pred}")
+    print(f"Trawa (suma): {state['vegetation_food'].sum():.4f}")
+    print(f"Czas odtwarzania: {elapsed:.4f} s")
+
+    if args.out is not None:
+        np.savez(args.out, **state)
+        print(f"Zapisano stan -> {args.out}")